@@ -4,11 +4,24 @@ Data models for ExacqMan Web API
 Defines Pydantic models for request/response validation and serialization.
 """
 
-from pydantic import BaseModel, Field, validator
-from typing import Optional, Dict, Any, List, Union
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 from enum import Enum
 
+__all__ = [
+    "QualityLevel",
+    "JobStatusEnum",
+    "ExtractRequest",
+    "ProcessedVideo",
+    "CameraInfo",
+    "ConfigInfo",
+    "JobStatus",
+    "FileInfo",
+    "ApiResponse",
+    "UploadResponse",
+]
+
 class QualityLevel(str, Enum):
     """Video quality levels for compression."""
     LOW = "low"
@@ -24,40 +37,28 @@ class JobStatusEnum(str, Enum):
 
 class ExtractRequest(BaseModel):
     """Request model for video extraction."""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     camera_alias: str = Field(..., description="Camera alias from config")
-    start_datetime: Union[datetime, str] = Field(..., description="Start datetime for video extraction")
-    end_datetime: Union[datetime, str] = Field(..., description="End datetime for video extraction")
+    # ISO 8601 strings (YYYY-MM-DDTHH:MM[:SS][Z]) are parsed by pydantic-core.
+    start_datetime: datetime = Field(..., description="Start datetime for video extraction")
+    end_datetime: datetime = Field(..., description="End datetime for video extraction")
     timelapse_multiplier: int = Field(10, description="Timelapse multiplier (1-50)")
-    config_file: str = Field(..., description="Path to config file")
+    config_file: str = Field(..., description="Config file name (see /api/configs)")
     server: Optional[str] = Field(None, description="Server location initials")
     
-    @validator('timelapse_multiplier')
+    @field_validator('timelapse_multiplier')
+    @classmethod
     def validate_multiplier(cls, v):
         if not (1 <= v <= 50):
             raise ValueError('Timelapse multiplier must be between 1 and 50')
         return v
     
-    @validator('start_datetime', pre=True)
-    def parse_start_datetime(cls, v):
-        if isinstance(v, str):
-            try:
-                return datetime.fromisoformat(v.replace('Z', '+00:00'))
-            except ValueError:
-                raise ValueError('Invalid start datetime format. Use ISO format (YYYY-MM-DDTHH:MM)')
-        return v
-    
-    @validator('end_datetime', pre=True)
-    def parse_end_datetime(cls, v):
-        if isinstance(v, str):
-            try:
-                return datetime.fromisoformat(v.replace('Z', '+00:00'))
-            except ValueError:
-                raise ValueError('Invalid end datetime format. Use ISO format (YYYY-MM-DDTHH:MM)')
-        return v
-    
-    @validator('end_datetime')
-    def validate_end_after_start(cls, v, values):
-        if 'start_datetime' in values and v <= values['start_datetime']:
+    @field_validator('end_datetime')
+    @classmethod
+    def validate_end_after_start(cls, v, info: ValidationInfo):
+        start = info.data.get('start_datetime')
+        if start is not None and v <= start:
             raise ValueError('End datetime must be after start datetime')
         return v
 
@@ -4,39 +4,140 @@ API Routes for ExacqMan Web Server
 Defines REST API endpoints for video processing operations.
 """
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
-from typing import Optional, List, Dict, Any
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Header, Query, Response
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
+from pydantic import TypeAdapter
+from functools import lru_cache
+from typing import Optional, List, Dict, Tuple, AsyncIterator
 import uuid
 import asyncio
+import anyio
+import hashlib
 import logging
-from datetime import datetime
+import time
 import os
+import re
+import stat
+from urllib.parse import quote
 
 from api.models import (
     ExtractRequest, ProcessedVideo, CameraInfo, ConfigInfo,
-    JobStatus, FileInfo, ApiResponse
+    JobStatus, JobStatusEnum, FileInfo, ApiResponse
 )
+from services import get_config_service, get_exacqman_service, get_file_service, get_job_store
 from services.exacqman_service import ExacqManService
 from services.file_service import FileService
 from services.config_service import ConfigService
+from services.job_store import JobRecord, JobStore
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# Initialize services
-exacqman_service = ExacqManService()
-file_service = FileService()
-config_service = ConfigService()
+# Serializer for /files, built once instead of per response
+FILE_LIST_ADAPTER = TypeAdapter(List[FileInfo])
 
-# Global job tracking (in production, use Redis or database)
-active_jobs: Dict[str, Dict[str, Any]] = {}
+# Filenames accepted from URL path parameters (matched with fullmatch): a single
+# path component with no leading dot and no control characters (rejects "..",
+# hidden files, separators and a trailing newline). Any other character is
+# allowed, so exports named from older, looser aliases (parentheses,
+# non-ASCII) can still be downloaded and deleted.
+_SAFE_NAME = re.compile(r"[^./\\\x00-\x1f\x7f][^/\\\x00-\x1f\x7f]{0,254}")
+
+# Single byte range request header: "bytes=0-1023", "bytes=1048576-" or a
+# suffix range such as "bytes=-500" (the last 500 bytes)
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+# Read size for ranged downloads
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+def _config_cache_key(config_file: str) -> Tuple[str, int]:
+    """
+    Resolve a config file to the (path, st_mtime_ns) pair used as a cache key.
+    
+    Editing the file bumps its mtime, so cached entries for the old contents
+    are simply never looked up again.
+    
+    Raises:
+        FileNotFoundError: If the config file doesn't exist
+    """
+    config_path = str(get_config_service().resolve_config_path(config_file))
+    return config_path, os.stat(config_path).st_mtime_ns
+
+@lru_cache(maxsize=32)
+def _config_info_cached(config_path: str, mtime_ns: int) -> ConfigInfo:
+    """Memoized ConfigInfo for a config file revision."""
+    return get_config_service().get_config_info(config_path)
+
+@lru_cache(maxsize=32)
+def _cameras_cached(config_path: str, mtime_ns: int) -> Tuple[CameraInfo, ...]:
+    """Memoized camera list for a config file revision."""
+    return tuple(get_config_service().get_available_cameras(config_path))
+
+@lru_cache(maxsize=4)
+def _config_files_cached(directory: str, mtime_ns: int) -> Tuple[str, ...]:
+    """Memoized config file listing, keyed on the containing directory's mtime."""
+    return tuple(get_config_service().get_available_config_files())
+
+def _config_dir_key() -> Tuple[str, int]:
+    """Return the (directory, st_mtime_ns) pair identifying the current config listing."""
+    directory = str(get_config_service().working_directory)
+    return directory, os.stat(directory).st_mtime_ns
+
+def load_config_files() -> Tuple[str, ...]:
+    """
+    List the available config files, rescanning only when the directory changes.
+    """
+    return _config_files_cached(*_config_dir_key())
+
+def _etag(*parts: object) -> str:
+    """Build a weak ETag from the values that determine a response body."""
+    digest = hashlib.blake2b(":".join(map(str, parts)).encode(), digest_size=8).hexdigest()
+    return f'W/"{digest}"'
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag using weak comparison."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque_tag for tag in if_none_match.split(","))
+
+def _cache_headers(etag: str) -> Dict[str, str]:
+    """Headers that let clients cache a response but revalidate it on every use."""
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+# Maximum number of extract jobs running at once. Each job drives an
+# exacqman.py subprocess doing video download and encoding, so extra jobs
+# wait in the queued state instead of competing for CPU and bandwidth.
+MAX_CONCURRENT_JOBS = 2
+_job_slots = asyncio.Semaphore(MAX_CONCURRENT_JOBS)
+
+# Seconds between SSE comment lines on an idle status stream, so proxies
+# don't drop the connection during long processing stages
+STATUS_STREAM_KEEPALIVE = 15.0
+
+def _job_status(job_id: str, job: JobRecord) -> JobStatus:
+    """Build the JobStatus response for a job record."""
+    # Job state is written only by this module, so skip re-validation.
+    return JobStatus.model_construct(
+        job_id=job_id,
+        status=job.status,
+        progress=job.progress,
+        message=job.message,
+        created_at=job.created_at_iso(),
+        completed_at=job.completed_at_iso(),
+        result=job.result
+    )
 
 @router.post("/extract", response_model=ApiResponse)
 async def extract_video(
     request: ExtractRequest,
-    background_tasks: BackgroundTasks
+    background_tasks: BackgroundTasks,
+    exacqman_service: ExacqManService = Depends(get_exacqman_service),
+    config_service: ConfigService = Depends(get_config_service),
+    job_store: JobStore = Depends(get_job_store)
 ) -> ApiResponse:
     """
     Extract video from Exacqvision server with timelapse and compression.
@@ -44,13 +145,24 @@ async def extract_video(
     Args:
         request: ExtractRequest containing all necessary parameters
         background_tasks: FastAPI background tasks for async processing
+        exacqman_service: Service that runs the extraction
+        config_service: Service used to validate the camera
+        job_store: Registry the new job is added to
         
     Returns:
         ApiResponse with job ID for tracking
     """
     try:
         # Generate job ID
-        job_id = str(uuid.uuid4())
+        job_id = uuid.uuid4().hex
+        
+        # Only config files from the current listing may be used; this also
+        # keeps paths outside the ExacqMan directory out of the CLI
+        if request.config_file not in load_config_files():
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown configuration file: {request.config_file}"
+            )
         
         # Validate camera exists in config
         if not config_service.validate_camera(request.config_file, request.camera_alias):
@@ -60,17 +172,16 @@ async def extract_video(
             )
         
         # Add job to tracking
-        active_jobs[job_id] = {
-            "status": "queued",
-            "created_at": datetime.now().isoformat(),
-            "operation": "extract",
-            "request": request.dict(),
-            "progress": 0,
-            "message": "Job queued for processing"
-        }
+        job_store.add(job_id, JobRecord(
+            status=JobStatusEnum.QUEUED,
+            created_at=time.time_ns(),
+            operation="extract",
+            request=request.model_dump(mode="python", exclude={"config_file"}),
+            message="Job queued for processing"
+        ))
         
         # Start extraction in background
-        background_tasks.add_task(process_extract_job, job_id, request)
+        background_tasks.add_task(process_extract_job, job_id, request, exacqman_service, job_store)
         
         logger.info(f"Extract job {job_id} queued for camera {request.camera_alias}")
         
@@ -80,40 +191,47 @@ async def extract_video(
             data={"job_id": job_id}
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error creating extract job: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to create extract job: {str(e)}")
 
-@router.get("/status/{job_id}", response_model=JobStatus)
-async def get_job_status(job_id: str) -> JobStatus:
+@router.get(
+    "/status/{job_id}",
+    response_model=None,
+    responses={200: {"model": JobStatus}},
+    deprecated=True,
+)
+async def get_job_status(
+    job_id: str,
+    job_store: JobStore = Depends(get_job_store)
+) -> JobStatus:
     """
     Get the status of a processing job.
     
+    Deprecated: clients should subscribe to /status/{job_id}/stream instead of
+    polling. This endpoint is kept for compatibility and as a fallback for
+    browsers without EventSource support.
+    
     Args:
         job_id: Unique job identifier
+        job_store: Registry holding job records
         
     Returns:
         JobStatus object with current job information
     """
     try:
-        logger.info(f"Getting status for job {job_id}")
-        
-        if job_id not in active_jobs:
-            logger.warning(f"Job {job_id} not found in active_jobs")
+        job = job_store.get(job_id)
+        if job is None:
+            logger.warning(f"Job {job_id} not found in job store")
             raise HTTPException(status_code=404, detail="Job not found")
         
-        job = active_jobs[job_id]
-        logger.info(f"Job {job_id} status: {job.get('status', 'unknown')}")
-        
-        return JobStatus(
-            job_id=job_id,
-            status=job["status"],
-            progress=job.get("progress", 0),
-            message=job.get("message", ""),
-            created_at=job["created_at"],
-            completed_at=job.get("completed_at"),
-            result=job.get("result")
-        )
+        # Polled every second per job; don't format the message unless it is logged
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Job {job_id} status: {job.status}")
+        
+        return _job_status(job_id, job)
         
     except HTTPException:
         raise
@@ -121,45 +239,228 @@ async def get_job_status(job_id: str) -> JobStatus:
         logger.error(f"Error getting job status for {job_id}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get job status: {str(e)}")
 
-@router.get("/files", response_model=List[FileInfo])
-async def list_processed_videos() -> List[FileInfo]:
+@router.get("/status/{job_id}/stream")
+async def stream_job_status(
+    job_id: str,
+    job_store: JobStore = Depends(get_job_store)
+) -> StreamingResponse:
+    """
+    Stream status updates for a processing job as server-sent events.
+    
+    The current status is sent immediately, then one event per change until the
+    job completes or fails, after which the stream is closed.
+    
+    Args:
+        job_id: Unique job identifier
+        job_store: Registry holding job records
+        
+    Returns:
+        StreamingResponse with media type text/event-stream
+    """
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    async def event_gen() -> AsyncIterator[str]:
+        while True:
+            # Grab the event before reading state so a change made while the
+            # client is being written to is not missed.
+            changed = job.next_change()
+            yield f"data: {_job_status(job_id, job).model_dump_json()}\n\n"
+            if job.is_finished():
+                return
+            while True:
+                try:
+                    await asyncio.wait_for(changed.wait(), STATUS_STREAM_KEEPALIVE)
+                    break
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+    
+    return StreamingResponse(
+        event_gen(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get(
+    "/files",
+    response_model=None,
+    responses={200: {"model": List[FileInfo]}},
+)
+async def list_processed_videos(
+    limit: Optional[int] = Query(None, ge=1),
+    if_none_match: Optional[str] = Header(None),
+    file_service: FileService = Depends(get_file_service)
+) -> ORJSONResponse:
     """
     List all processed video files.
     
+    The ETag follows FileService's listing version, which changes when a
+    video is added, removed, renamed or rewritten in place, so unchanged
+    listings get a 304 without the listing being built.
+    
+    Args:
+        limit: Optional number of newest videos to return
+        if_none_match: Optional If-None-Match request header
+        file_service: Service for the exports directory
+        
     Returns:
-        List of FileInfo objects for processed videos
+        JSON list of FileInfo objects for processed videos
     """
     try:
-        files = file_service.get_processed_videos()
-        return files
+        # Version before listing: if the videos change in between, the body is
+        # newer than the ETag and the next request simply gets a full response
+        listing_version = await asyncio.to_thread(file_service.listing_version)
+        etag = _etag(*listing_version, limit)
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=_cache_headers(etag))
+        
+        files = await asyncio.to_thread(file_service.get_processed_videos, limit)
+        return ORJSONResponse(
+            FILE_LIST_ADAPTER.dump_python(files, mode="json"),
+            headers=_cache_headers(etag)
+        )
         
     except Exception as e:
         logger.error(f"Error listing processed videos: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to list files: {str(e)}")
 
+def _locate_export(file_service: FileService, filename: str) -> Tuple[str, os.stat_result]:
+    """
+    Find an exported video and stat it; blocking, so run it in a worker thread.
+    
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+    """
+    file_path = file_service.get_file_path(filename)
+    return file_path, os.stat(file_path)
+
+def _content_disposition(filename: str) -> str:
+    """
+    Build an attachment Content-Disposition header the way FileResponse does.
+    
+    Names that aren't plain URL-safe text (non-ASCII, quotes, spaces) go in
+    the RFC 5987 filename* form, since header values must be latin-1.
+    """
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+def _parse_range(range_header: str, file_size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single byte range into inclusive offsets.
+    
+    Args:
+        range_header: Value of the Range request header
+        file_size: Size of the requested file in bytes
+        
+    Returns:
+        (start, end) offsets, or None if the header isn't a valid single range,
+        in which case the whole file is sent
+        
+    Raises:
+        HTTPException: 416 if the range lies entirely outside the file
+    """
+    match = _RANGE_RE.match(range_header.strip())
+    if match is None or match.group(1) == match.group(2) == "":
+        return None
+    
+    if match.group(1) == "":
+        # Suffix range: the last N bytes
+        suffix_length = int(match.group(2))
+        start, end = max(file_size - suffix_length, 0), file_size - 1
+        satisfiable = suffix_length > 0 and file_size > 0
+    else:
+        start = int(match.group(1))
+        end = file_size - 1
+        if match.group(2):
+            if int(match.group(2)) < start:
+                return None
+            end = min(int(match.group(2)), end)
+        satisfiable = start < file_size
+    
+    if not satisfiable:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{file_size}"}
+        )
+    return start, end
+
+async def _iter_file_range(path: str, start: int, end: int) -> AsyncIterator[bytes]:
+    """Yield bytes start..end (inclusive) of a file, reading off the event loop thread."""
+    remaining = end - start + 1
+    async with await anyio.open_file(path, "rb") as f:
+        await f.seek(start)
+        while remaining > 0:
+            chunk = await f.read(min(DOWNLOAD_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
 @router.get("/download/{filename}")
-async def download_video(filename: str):
+async def download_video(
+    filename: str,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    file_service: FileService = Depends(get_file_service)
+):
     """
     Download a processed video file.
     
+    A single byte range may be requested with the Range header, so downloads
+    can be resumed and players can seek without fetching the whole file.
+    
     Args:
         filename: Name of the file to download
+        range_header: Optional Range request header
+        file_service: Service for the exports directory
         
     Returns:
-        FileResponse with the video file
+        FileResponse with the video file, or a 206 StreamingResponse with the
+        requested byte range
     """
+    if not _SAFE_NAME.fullmatch(filename):
+        raise HTTPException(status_code=400, detail="Invalid filename")
+    
     try:
-        file_path = file_service.get_file_path(filename)
-        
-        if not os.path.exists(file_path):
+        # Stat once and hand the result to FileResponse so it doesn't stat again
+        # for Content-Length/ETag/Last-Modified.
+        file_path, file_stat = await asyncio.to_thread(_locate_export, file_service, filename)
+        if not stat.S_ISREG(file_stat.st_mode):
             raise HTTPException(status_code=404, detail="File not found")
         
+        byte_range = None
+        if range_header:
+            byte_range = _parse_range(range_header, file_stat.st_size)
+        
+        if byte_range is not None:
+            start, end = byte_range
+            return StreamingResponse(
+                _iter_file_range(str(file_path), start, end),
+                status_code=206,
+                media_type="video/mp4",
+                headers={
+                    "Content-Range": f"bytes {start}-{end}/{file_stat.st_size}",
+                    "Content-Length": str(end - start + 1),
+                    "Accept-Ranges": "bytes",
+                    "Content-Disposition": _content_disposition(filename),
+                }
+            )
+        
         return FileResponse(
             path=file_path,
-            filename=filename,
-            media_type="video/mp4"
+            media_type="video/mp4",
+            stat_result=file_stat,
+            headers={
+                "Accept-Ranges": "bytes",
+                "Content-Disposition": _content_disposition(filename),
+            }
         )
         
+    except HTTPException:
+        raise
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="File not found")
     except Exception as e:
@@ -167,34 +468,61 @@ async def download_video(filename: str):
         raise HTTPException(status_code=500, detail=f"Failed to download file: {str(e)}")
 
 @router.get("/configs", response_model=List[str])
-async def get_available_configs() -> List[str]:
+async def get_available_configs(
+    response: Response,
+    if_none_match: Optional[str] = Header(None)
+) -> List[str]:
     """
     Get list of available configuration files.
     
+    Args:
+        response: Response whose headers carry the ETag
+        if_none_match: Optional If-None-Match request header
+        
     Returns:
         List of configuration file names
     """
     try:
-        config_files = config_service.get_available_config_files()
-        return config_files
+        dir_key = _config_dir_key()
+        etag = _etag(*dir_key)
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=_cache_headers(etag))
+        
+        response.headers.update(_cache_headers(etag))
+        return list(_config_files_cached(*dir_key))
     except Exception as e:
         logger.error(f"Error getting available configs: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to get available configurations")
 
-@router.get("/config/{config_file}", response_model=ConfigInfo)
-async def get_config_info(config_file: str) -> ConfigInfo:
+@router.get(
+    "/config/{config_file}",
+    response_model=None,
+    responses={200: {"model": ConfigInfo}},
+)
+async def get_config_info(
+    config_file: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None)
+) -> ConfigInfo:
     """
     Get configuration information including available cameras and servers.
     
     Args:
         config_file: Path to the configuration file
+        response: Response whose headers carry the ETag
+        if_none_match: Optional If-None-Match request header
         
     Returns:
         ConfigInfo with available cameras, servers, and options
     """
     try:
-        config_info = config_service.get_config_info(config_file)
-        return config_info
+        config_key = _config_cache_key(config_file)
+        etag = _etag(*config_key)
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=_cache_headers(etag))
+        
+        response.headers.update(_cache_headers(etag))
+        return _config_info_cached(*config_key)
         
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"Configuration file not found: {config_file}")
@@ -202,20 +530,35 @@ async def get_config_info(config_file: str) -> ConfigInfo:
         logger.error(f"Error getting config info: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get configuration: {str(e)}")
 
-@router.get("/cameras/{config_file}", response_model=List[CameraInfo])
-async def get_cameras(config_file: str) -> List[CameraInfo]:
+@router.get(
+    "/cameras/{config_file}",
+    response_model=None,
+    responses={200: {"model": List[CameraInfo]}},
+)
+async def get_cameras(
+    config_file: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None)
+) -> List[CameraInfo]:
     """
     Get list of available cameras from configuration file.
     
     Args:
         config_file: Path to the configuration file
+        response: Response whose headers carry the ETag
+        if_none_match: Optional If-None-Match request header
         
     Returns:
         List of CameraInfo objects
     """
     try:
-        cameras = config_service.get_available_cameras(config_file)
-        return cameras
+        config_key = _config_cache_key(config_file)
+        etag = _etag(*config_key)
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=_cache_headers(etag))
+        
+        response.headers.update(_cache_headers(etag))
+        return list(_cameras_cached(*config_key))
         
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"Configuration file not found: {config_file}")
@@ -224,18 +567,25 @@ async def get_cameras(config_file: str) -> List[CameraInfo]:
         raise HTTPException(status_code=500, detail=f"Failed to get cameras: {str(e)}")
 
 @router.delete("/files/{filename}", response_model=ApiResponse)
-async def delete_video(filename: str) -> ApiResponse:
+async def delete_video(
+    filename: str,
+    file_service: FileService = Depends(get_file_service)
+) -> ApiResponse:
     """
     Delete a processed video file.
     
     Args:
         filename: Name of the file to delete
+        file_service: Service for the exports directory
         
     Returns:
         ApiResponse indicating success or failure
     """
+    if not _SAFE_NAME.fullmatch(filename):
+        raise HTTPException(status_code=400, detail="Invalid filename")
+    
     try:
-        success = file_service.delete_file(filename)
+        success = await asyncio.to_thread(file_service.delete_file, filename)
         
         if success:
             return ApiResponse(
@@ -253,45 +603,63 @@ async def delete_video(filename: str) -> ApiResponse:
 
 # Background task functions
 
-async def process_extract_job(job_id: str, request: ExtractRequest):
+async def process_extract_job(
+    job_id: str,
+    request: ExtractRequest,
+    exacqman_service: ExacqManService,
+    job_store: JobStore
+):
     """
     Process an extract job in the background with real-time progress tracking.
     
     Args:
         job_id: Unique job identifier
         request: ExtractRequest object
+        exacqman_service: Service that runs the extraction
+        job_store: Registry holding the job's record
     """
+    # Running jobs are never evicted, so the record stays valid throughout
+    job = job_store.get(job_id)
+    
     def update_progress(progress: int, message: str):
         """Update job progress in real-time."""
-        if job_id in active_jobs:
-            active_jobs[job_id]["progress"] = progress
-            active_jobs[job_id]["message"] = message
-            logger.info(f"Job {job_id}: {message} ({progress}%)")
+        job.update(progress=progress, message=message)
+        logger.info(f"Job {job_id}: {message} ({progress}%)")
     
+    # Wait for a free slot; until then the job stays queued
+    await _job_slots.acquire()
     try:
         # Update job status
-        active_jobs[job_id]["status"] = "processing"
-        active_jobs[job_id]["message"] = "Starting video extraction..."
-        active_jobs[job_id]["progress"] = 0
+        job.update(
+            status=JobStatusEnum.PROCESSING,
+            message="Starting video extraction...",
+            progress=0
+        )
         
         # Run the extraction with progress tracking
         result = await exacqman_service.extract_video_with_progress(request, update_progress)
         
         # Update job status with success
-        active_jobs[job_id]["status"] = "completed"
-        active_jobs[job_id]["message"] = "Footage extraction completed successfully"
-        active_jobs[job_id]["progress"] = 100
-        active_jobs[job_id]["completed_at"] = datetime.now().isoformat()
-        active_jobs[job_id]["result"] = result
+        job.update(
+            status=JobStatusEnum.COMPLETED,
+            message="Footage extraction completed successfully",
+            progress=100,
+            completed_at=time.time_ns(),
+            result=result
+        )
         
         logger.info(f"Extract job {job_id} completed successfully")
         
     except Exception as e:
         # Update job status with error
-        active_jobs[job_id]["status"] = "failed"
-        active_jobs[job_id]["message"] = f"Video extraction failed: {str(e)}"
-        active_jobs[job_id]["progress"] = 0
-        active_jobs[job_id]["completed_at"] = datetime.now().isoformat()
-        active_jobs[job_id]["error"] = str(e)
+        job.update(
+            status=JobStatusEnum.FAILED,
+            message=f"Video extraction failed: {str(e)}",
+            progress=0,
+            completed_at=time.time_ns(),
+            error=str(e)
+        )
         
-        logger.error(f"Extract job {job_id} failed: {str(e)}")
\ No newline at end of file
+        logger.error(f"Extract job {job_id} failed: {str(e)}")
+    finally:
+        _job_slots.release()
\ No newline at end of file
@@ -5,43 +5,68 @@ A web interface for the ExacqMan video processing tool that provides REST API en
 for video extraction, compression, and timelapse operations.
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, UploadFile, File
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import ORJSONResponse
 import uvicorn
 import os
+import sys
 import asyncio
-from pathlib import Path
-from typing import Optional, Dict, Any
-import json
 import logging
 from datetime import datetime
 
 from api.routes import router
-from services.exacqman_service import ExacqManService
-from services.file_service import FileService
+from services import get_job_store
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """
+    GZip middleware that leaves video downloads and status streams alone.
+    
+    Videos are already compressed, and gzip would buffer server-sent events
+    instead of forwarding them as they are produced.
+    """
+    
+    skip_prefixes = ("/api/download/", "/exports/")
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            path = scope["path"]
+            if path.startswith(self.skip_prefixes) or path.endswith("/stream"):
+                await self.app(scope, receive, send)
+                return
+        await super().__call__(scope, receive, send)
+
 # Create FastAPI app
 app = FastAPI(
     title="ExacqMan Web API",
     description="Web interface for ExacqMan video processing tool",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
-# Add CORS middleware for frontend communication
+# Add CORS middleware for frontend communication. Set CORS_ORIGINS to a
+# comma-separated list of frontend URLs in production; any origin is allowed
+# otherwise. The frontend sends no cookies, so credentials are not allowed.
+cors_origins = [
+    origin.strip() for origin in (os.environ.get("CORS_ORIGINS") or "*").split(",") if origin.strip()
+]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, specify actual frontend URL
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=cors_origins,
+    allow_credentials=False,
+    allow_methods=["GET", "POST", "DELETE"],
+    allow_headers=["Content-Type", "Range"],
 )
 
+# Compress JSON and frontend assets; small bodies aren't worth the CPU
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=1024, compresslevel=6)
+
 # Include API routes FIRST (before static file mounts)
 app.include_router(router, prefix="/api")
 
@@ -62,12 +87,17 @@ app.mount("/exports", StaticFiles(directory="exports"), name="exports")
 # Mount frontend files (this should be LAST to catch all other routes)
 app.mount("/", StaticFiles(directory="../frontend", html=True), name="frontend")
 
-# Initialize services
-exacqman_service = ExacqManService()
-file_service = FileService()
+# How long finished jobs stay queryable, and how often expired ones are dropped
+JOB_RETENTION_SECONDS = 3600
+JOB_PURGE_INTERVAL_SECONDS = 60
 
-# Global job tracking (in production, use Redis or database)
-active_jobs: Dict[str, Dict[str, Any]] = {}
+async def purge_finished_jobs():
+    """Periodically drop finished jobs older than JOB_RETENTION_SECONDS."""
+    while True:
+        await asyncio.sleep(JOB_PURGE_INTERVAL_SECONDS)
+        removed = get_job_store().purge_finished(JOB_RETENTION_SECONDS)
+        if removed:
+            logger.info(f"Purged {removed} finished jobs")
 
 @app.on_event("startup")
 async def startup_event():
@@ -77,12 +107,16 @@ async def startup_event():
     # Ensure exports directory exists
     os.makedirs("exports", exist_ok=True)
     
+    app.state.job_purge_task = asyncio.create_task(purge_finished_jobs())
+    
     logger.info("ExacqMan Web Server started successfully")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on application shutdown."""
     logger.info("Shutting down ExacqMan Web Server...")
+    
+    app.state.job_purge_task.cancel()
 
 @app.get("/")
 async def root():
@@ -106,5 +140,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
+        # uvloop drives the CLI subprocess pipes faster than the stdlib loop
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
         log_level="info"
     )
@@ -24,12 +24,25 @@ if __name__ == "__main__":
                        help='Host to bind the server to (default: 0.0.0.0)')
     parser.add_argument('--no-reload', action='store_true',
                        help='Disable auto-reload for production')
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                       help='Number of worker processes (default: 1). Job status is '
+                            'tracked in-process, so status lookups only work '
+                            'reliably with a single worker')
+    parser.add_argument('--loop', default='asyncio' if sys.platform == 'win32' else 'uvloop',
+                       choices=['auto', 'asyncio', 'uvloop'],
+                       help='Event loop implementation (default: uvloop, asyncio on Windows)')
+    parser.add_argument('--http', default='httptools',
+                       choices=['auto', 'h11', 'httptools'],
+                       help='HTTP protocol implementation (default: httptools)')
     
     args = parser.parse_args()
     
     # Change to the backend directory
     os.chdir(backend_dir)
     
+    # uvicorn can't auto-reload with multiple worker processes
+    reload = not args.no_reload and args.workers == 1
+    
     print(f"Starting ExacqMan Web Server on {args.host}:{args.port}")
     
     # Start the server
@@ -37,7 +50,12 @@ if __name__ == "__main__":
         "app:app",
         host=args.host,
         port=args.port,
-        reload=not args.no_reload,
+        reload=reload,
+        workers=args.workers,
+        loop=args.loop,
+        http=args.http,
+        limit_concurrency=1000,
+        timeout_keep_alive=30,
         log_level="info",
         access_log=True
     )
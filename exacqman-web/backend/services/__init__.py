@@ -1 +1,31 @@
 # Services package initialization
+#
+# Each service is created once per process through a cached getter. Route
+# handlers receive them with FastAPI's Depends(); other code calls the getter.
+
+from functools import lru_cache
+
+from services.config_service import ConfigService
+from services.exacqman_service import ExacqManService
+from services.file_service import FileService
+from services.job_store import JobStore
+
+@lru_cache(maxsize=1)
+def get_exacqman_service() -> ExacqManService:
+    """Return the shared ExacqManService."""
+    return ExacqManService()
+
+@lru_cache(maxsize=1)
+def get_file_service() -> FileService:
+    """Return the shared FileService."""
+    return FileService()
+
+@lru_cache(maxsize=1)
+def get_config_service() -> ConfigService:
+    """Return the shared ConfigService."""
+    return ConfigService()
+
+@lru_cache(maxsize=1)
+def get_job_store() -> JobStore:
+    """Return the process-wide JobStore."""
+    return JobStore()
@@ -6,12 +6,42 @@ Handles reading and managing ExacqMan configuration files for the web applicatio
 
 import configparser
 import logging
+import os
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from api.models import CameraInfo, ConfigInfo
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=32)
+def _load_config(config_path: str, mtime_ns: int) -> configparser.ConfigParser:
+    """
+    Parse a configuration file, memoized per file revision.
+    
+    mtime_ns is part of the cache key, so editing the file causes a re-parse
+    and the stale entry ages out of the LRU. Callers must not modify the
+    returned parser.
+    """
+    config = configparser.ConfigParser()
+    config.optionxform = str  # Preserve original case
+    config.read(config_path)
+    return config
+
+@lru_cache(maxsize=32)
+def _camera_map(config_path: str, mtime_ns: int) -> Dict[str, str]:
+    """
+    Map camera aliases to camera IDs for a configuration file revision.
+    
+    Built from the memoized parse, so alias lookups are a dict hit. Callers
+    must not modify the returned dict.
+    """
+    config = _load_config(config_path, mtime_ns)
+    if 'Cameras' not in config:
+        logger.warning(f"No [Cameras] section found in {config_path}")
+        return {}
+    return dict(config['Cameras'])
+
 class ConfigService:
     """Service for managing ExacqMan configuration files."""
     
@@ -20,6 +50,67 @@ class ConfigService:
         self.working_directory = Path(__file__).parent.parent.parent.parent  # ExacqMan root
         self.timelapse_options = [1, 2, 5, 10, 15, 20, 25, 30, 40, 50]
     
+    def resolve_config_path(self, config_file: str) -> Path:
+        """
+        Resolve a configuration file name to its path on disk.
+        
+        Args:
+            config_file: Path to the configuration file, absolute or relative
+                to the ExacqMan root directory
+            
+        Returns:
+            Path to the configuration file
+        """
+        config_path = Path(config_file)
+        if not config_path.is_absolute():
+            config_path = self.working_directory / config_file
+        return config_path
+    
+    def _config_key(self, config_file: str) -> Tuple[str, int]:
+        """
+        Resolve a configuration file to the (path, st_mtime_ns) key of its parse caches.
+        
+        Args:
+            config_file: Path to the configuration file
+            
+        Returns:
+            Tuple of the resolved path and its modification time in nanoseconds
+            
+        Raises:
+            FileNotFoundError: If config file doesn't exist
+        """
+        config_path = str(self.resolve_config_path(config_file))
+        try:
+            return config_path, os.stat(config_path).st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Configuration file not found: {config_file}") from None
+    
+    def _read_config(self, config_file: str) -> configparser.ConfigParser:
+        """Load a configuration file, reusing the parsed result until it changes."""
+        return _load_config(*self._config_key(config_file))
+    
+    def _cameras_by_alias(self, config_file: str) -> Dict[str, str]:
+        """Return the alias-to-ID map of a configuration file (shared; read-only)."""
+        return _camera_map(*self._config_key(config_file))
+    
+    def _cameras_from(self, camera_map: Dict[str, str]) -> List[CameraInfo]:
+        """Build CameraInfo objects from an alias-to-ID map."""
+        cameras = []
+        for alias, camera_id in camera_map.items():
+            cameras.append(CameraInfo(
+                alias=alias,
+                id=camera_id,
+                description=f"{alias} (ID: {camera_id})"
+            ))
+        return cameras
+    
+    def _servers_from(self, config: configparser.ConfigParser, config_file: str) -> Dict[str, str]:
+        """Read the [Network] section of a parsed config as a name-to-address dict."""
+        if 'Network' not in config:
+            logger.warning(f"No [Network] section found in {config_file}")
+            return {}
+        return dict(config['Network'])
+    
     def get_available_cameras(self, config_file: str) -> List[CameraInfo]:
         """
         Get list of available cameras from configuration file.
@@ -35,28 +126,7 @@ class ConfigService:
             configparser.Error: If config file is invalid
         """
         try:
-            config_path = Path(config_file)
-            if not config_path.is_absolute():
-                config_path = self.working_directory / config_file
-            
-            if not config_path.exists():
-                raise FileNotFoundError(f"Configuration file not found: {config_file}")
-            
-            config = configparser.ConfigParser()
-            config.optionxform = str  # Preserve original case
-            config.read(config_path)
-            
-            if 'Cameras' not in config:
-                logger.warning(f"No [Cameras] section found in {config_file}")
-                return []
-            
-            cameras = []
-            for alias, camera_id in config['Cameras'].items():
-                cameras.append(CameraInfo(
-                    alias=alias,
-                    id=camera_id,
-                    description=f"{alias} (ID: {camera_id})"
-                ))
+            cameras = self._cameras_from(self._cameras_by_alias(config_file))
             
             logger.info(f"Loaded {len(cameras)} cameras from {config_file}")
             return cameras
@@ -80,22 +150,7 @@ class ConfigService:
             configparser.Error: If config file is invalid
         """
         try:
-            config_path = Path(config_file)
-            if not config_path.is_absolute():
-                config_path = self.working_directory / config_file
-            
-            if not config_path.exists():
-                raise FileNotFoundError(f"Configuration file not found: {config_file}")
-            
-            config = configparser.ConfigParser()
-            config.optionxform = str  # Preserve original case
-            config.read(config_path)
-            
-            if 'Network' not in config:
-                logger.warning(f"No [Network] section found in {config_file}")
-                return {}
-            
-            servers = dict(config['Network'])
+            servers = self._servers_from(self._read_config(config_file), config_file)
             logger.info(f"Loaded {len(servers)} servers from {config_file}")
             return servers
             
@@ -114,8 +169,10 @@ class ConfigService:
             ConfigInfo object with all configuration data
         """
         try:
-            cameras = self.get_available_cameras(config_file)
-            servers = self.get_available_servers(config_file)
+            # One stat and one parse serve both sections
+            config_key = self._config_key(config_file)
+            cameras = self._cameras_from(_camera_map(*config_key))
+            servers = self._servers_from(_load_config(*config_key), config_file)
             
             return ConfigInfo(
                 cameras=cameras,
@@ -139,8 +196,7 @@ class ConfigService:
             True if camera exists, False otherwise
         """
         try:
-            cameras = self.get_available_cameras(config_file)
-            return any(camera.alias == camera_alias for camera in cameras)
+            return camera_alias in self._cameras_by_alias(config_file)
         except Exception as e:
             logger.error(f"Error validating camera {camera_alias}: {str(e)}")
             return False
@@ -157,11 +213,7 @@ class ConfigService:
             Camera ID if found, None otherwise
         """
         try:
-            cameras = self.get_available_cameras(config_file)
-            for camera in cameras:
-                if camera.alias == camera_alias:
-                    return camera.id
-            return None
+            return self._cameras_by_alias(config_file).get(camera_alias)
         except Exception as e:
             logger.error(f"Error getting camera ID for {camera_alias}: {str(e)}")
             return None
@@ -174,9 +226,13 @@ class ConfigService:
             List of configuration file paths
         """
         try:
-            config_files = []
-            for file_path in self.working_directory.glob("*.config"):
-                config_files.append(file_path.name)
+            # A suffix test per directory entry; glob would translate the
+            # pattern and build a Path for every match
+            with os.scandir(self.working_directory) as entries:
+                config_files = [
+                    entry.name for entry in entries
+                    if entry.name.endswith(".config") and entry.is_file()
+                ]
             
             logger.info(f"Found {len(config_files)} configuration files")
             return config_files
@@ -196,22 +252,14 @@ class ConfigService:
             True if valid, False otherwise
         """
         try:
-            config_path = Path(config_file)
-            if not config_path.is_absolute():
-                config_path = self.working_directory / config_file
-            
-            if not config_path.exists():
-                return False
-            
-            # Try to parse the config file
-            config = configparser.ConfigParser()
-            config.optionxform = str  # Preserve original case
-            config.read(config_path)
+            config = self._read_config(config_file)
             
             # Check for required sections
             required_sections = ['Auth', 'Network', 'Cameras', 'Settings']
             return all(section in config for section in required_sections)
             
+        except FileNotFoundError:
+            return False
         except Exception as e:
             logger.error(f"Error validating config file {config_file}: {str(e)}")
             return False
@@ -5,10 +5,15 @@ Handles interaction with the ExacqMan CLI tool for video processing operations.
 """
 
 import asyncio
+import errno
+import fnmatch
 import json
-import subprocess
+import os
+import re
+import sys
 import logging
-from typing import Dict, Any, Callable, Optional
+from collections import deque
+from typing import Dict, Any, Callable, Deque, List, Optional, Tuple
 from pathlib import Path
 import shutil
 
@@ -37,6 +42,73 @@ _STAGE_MESSAGES = {
     "compression":     "Compressing video",
 }
 
+# Leftover temporary files removed from the working directory after each job.
+# Log files are only removed when they belong to the job (see cleanup), so a
+# log another process is still writing is never deleted.
+_TEMP_FILE_PATTERNS = ("*.tmp", "*_temp.*", "*_intermediate.*", "temp_*")
+# All of the above as one compiled regex, so each name is tested once
+_TEMP_FILE_RE = re.compile("|".join(fnmatch.translate(pattern) for pattern in _TEMP_FILE_PATTERNS))
+
+# Name fragments of the final compressed output, which cleanup must keep
+_COMPRESSED_MARKERS = ('_libx264_', '_high', '_medium', '_low')
+_COMPRESSED_RE = re.compile("|".join(map(re.escape, _COMPRESSED_MARKERS)))
+
+# Non-event CLI output lines kept for error reporting; older lines are dropped
+CLI_OUTPUT_TAIL_LINES = 200
+
+# Bytes taken from the CLI's stdout per read, and the StreamReader buffer limit
+CLI_READ_SIZE = 64 * 1024
+CLI_STREAM_LIMIT = 1024 * 1024
+
+# Characters replaced when a camera alias becomes part of an output filename.
+# Underscores separate the filename's fields, and anything else outside
+# letters, digits and '-' is kept out so names stay portable.
+_UNSAFE_ALIAS_CHARS = re.compile(r"[^a-z0-9-]")
+
+def _move_across_filesystems(source_path: str, dest_path: str) -> None:
+    """
+    Move a file to another filesystem, where a rename isn't possible.
+    
+    shutil.copy2 already copies with sendfile on Linux. The copy is checked
+    against the source size before the source is removed, so a short copy
+    never costs the only good file.
+    
+    Args:
+        source_path: File to move
+        dest_path: Destination path on the other filesystem
+        
+    Raises:
+        OSError: If the copy fails or comes out shorter than the source
+    """
+    size = os.stat(source_path).st_size
+    try:
+        shutil.copy2(source_path, dest_path)
+        copied = os.stat(dest_path).st_size
+        if copied != size:
+            raise OSError(f"Incomplete copy of {source_path}: {copied} of {size} bytes written")
+    except BaseException:
+        try:
+            os.unlink(dest_path)
+        except FileNotFoundError:
+            pass
+        raise
+    os.unlink(source_path)
+
+def _replace_or_move(source_path: str, dest_path: str) -> None:
+    """
+    Move a file into place, by rename where possible.
+    
+    A rename is a single metadata update (os.replace also overwrites an
+    older file on Windows); only fall back to copying when the destination
+    lives on another filesystem.
+    """
+    try:
+        os.replace(source_path, dest_path)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        _move_across_filesystems(source_path, dest_path)
+
 class ExacqManService:
     """Service for interacting with ExacqMan CLI tool."""
     
@@ -44,8 +116,17 @@ class ExacqManService:
         """Initialize the ExacqMan service."""
         # exacqman.py is always at the same level as exacqman-web directory
         # From backend/services/exacqman_service.py, go up 3 levels to reach ExacqMan root
-        self.exacqman_path = str(Path(__file__).parent.parent.parent.parent / "exacqman.py")
-        self.working_directory = Path(__file__).parent.parent.parent.parent  # ExacqMan root directory
+        self.working_directory = Path(__file__).parents[3]  # ExacqMan root directory
+        # String forms of the paths used on every job, so filesystem calls
+        # don't rebuild Path objects each time
+        self._working_dir = str(self.working_directory)
+        self.exacqman_path = os.path.join(self._working_dir, "exacqman.py")
+        self.exports_dir = os.path.join(self._working_dir, "exacqman-web", "exports")
+        # Create the exports directory up front; a move recreates it if it is
+        # removed while the server runs
+        os.makedirs(self.exports_dir, exist_ok=True)
+        # Resolve the interpreter once instead of searching PATH on every spawn
+        self.python_executable = shutil.which("python3") or sys.executable
     
     async def extract_video_with_progress(self, request: ExtractRequest, progress_callback: Callable[[int, str], None]) -> Dict[str, Any]:
         """
@@ -61,9 +142,10 @@ class ExacqManService:
         cmd_args = []
         try:
             # Convert datetime objects to the format expected by ExacqMan CLI
-            start_date = request.start_datetime.strftime("%m/%d")
-            start_time = request.start_datetime.strftime("%I:%M%p").lstrip('0')
-            end_time = request.end_datetime.strftime("%I:%M%p").lstrip('0')
+            start = request.start_datetime
+            start_date = f"{start.month:02d}/{start.day:02d}"
+            start_time = self._format_time_for_cli(start)
+            end_time = self._format_time_for_cli(request.end_datetime)
 
             # Generate output filename
             output_filename = self._generate_output_filename(request)
@@ -72,7 +154,7 @@ class ExacqManService:
             # -u runs Python unbuffered so events stream in real time.
             # --progress-format=json makes the CLI emit one JSON event per line.
             cmd_args = [
-                "python3", "-u", self.exacqman_path,
+                self.python_executable, "-u", self.exacqman_path,
                 "--progress-format=json",
                 "extract",
                 request.camera_alias,
@@ -88,38 +170,55 @@ class ExacqManService:
             if request.server:
                 cmd_args.extend(["--server", request.server])
 
-            logger.info(f"Running extract command: {' '.join(cmd_args)}")
-            logger.info(f"Working directory: {self.working_directory}")
-            logger.info(f"Config file: {request.config_file}")
+            logger.info("Running extract command: %s", cmd_args)
+            logger.info("Working directory: %s", self.working_directory)
+            logger.info("Config file: %s", request.config_file)
 
             progress_callback(0, "Starting video extraction...")
 
             process = await asyncio.create_subprocess_exec(
                 *cmd_args,
-                cwd=self.working_directory,
+                cwd=self._working_dir,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.STDOUT,  # Combine stderr with stdout
+                limit=CLI_STREAM_LIMIT,
             )
 
-            cli_error: Optional[Dict[str, Any]] = await self._consume_cli_events(
+            cli_error, output_tail, reported_output = await self._consume_cli_events(
                 process, progress_callback
             )
 
             await process.wait()
 
             if process.returncode != 0:
-                error_msg = (
-                    cli_error["message"] if cli_error
-                    else f"Extract command failed with return code {process.returncode}"
-                )
+                if cli_error:
+                    error_msg = cli_error["message"]
+                elif output_tail:
+                    # No error event (e.g. the CLI crashed before it could
+                    # report one); the last output line is usually the
+                    # exception from the traceback.
+                    logger.error("CLI output before failure:\n%s", "\n".join(output_tail))
+                    error_msg = output_tail[-1]
+                else:
+                    error_msg = f"Extract command failed with return code {process.returncode}"
                 logger.error(error_msg)
                 progress_callback(0, f"Error: {error_msg}")
-                raise subprocess.CalledProcessError(
-                    process.returncode, cmd_args, error_msg
-                )
+                # The message is what the job reports, so it carries the cause
+                # rather than the command line and return code
+                raise RuntimeError(error_msg)
 
-            final_path = await self._move_to_exports(output_filename)
-            await self._cleanup_intermediate_files(output_filename)
+            # Moving and unlinking files blocks, so keep it off the event loop.
+            # One listing of the working directory serves both finding the
+            # final file and cleanup. Once the final file is known, cleanup
+            # can run alongside the move as long as it leaves that file alone.
+            entries = await asyncio.to_thread(self._list_working_dir)
+            source_path = await asyncio.to_thread(
+                self._find_final_output, output_filename, reported_output, entries
+            )
+            final_path, _ = await asyncio.gather(
+                asyncio.to_thread(self._move_to_exports, output_filename, source_path),
+                asyncio.to_thread(self._cleanup_intermediate_files, output_filename, source_path, entries),
+            )
 
             return {
                 "operation": "extract",
@@ -142,33 +241,46 @@ class ExacqManService:
         self,
         process: asyncio.subprocess.Process,
         progress_callback: Callable[[int, str], None],
-    ) -> Optional[Dict[str, Any]]:
+    ) -> Tuple[Optional[Dict[str, Any]], List[str], Optional[str]]:
         """Read JSON events from the CLI subprocess and drive progress_callback.
 
-        Returns the last `error` event payload (if any), so the caller can use
-        its message when the subprocess exits non-zero. Non-JSON lines (e.g.
-        Python tracebacks, stray prints) are logged and otherwise ignored.
+        Returns the last `error` event payload (if any) and the most recent
+        non-event output lines, so the caller can build an error message when
+        the subprocess exits non-zero, plus the output path reported by the
+        `done` event (if any). Non-JSON lines (e.g. Python tracebacks,
+        stray prints) are logged and otherwise only kept in that bounded tail.
         """
         buffer = b""
         current_stage: Optional[str] = None
         last_error: Optional[Dict[str, Any]] = None
+        output_tail: Deque[str] = deque(maxlen=CLI_OUTPUT_TAIL_LINES)
+        reported_output: Optional[str] = None
 
         while True:
-            chunk = await process.stdout.read(8192)
+            chunk = await process.stdout.read(CLI_READ_SIZE)
             if not chunk:
                 if buffer:
                     trailing = buffer.decode("utf-8", errors="replace").strip()
                     if trailing:
                         logger.info("CLI Output (trailing, no newline): %s", trailing)
+                        output_tail.append(trailing)
                 break
             buffer += chunk
-            while b"\n" in buffer:
-                line_bytes, buffer = buffer.split(b"\n", 1)
-                line = line_bytes.decode("utf-8", errors="replace").strip()
-                if not line:
+            if b"\n" not in chunk:
+                continue
+            # Split every complete line at once; the last piece is partial
+            *lines, buffer = buffer.split(b"\n")
+            for line_bytes in lines:
+                line_bytes = line_bytes.strip()
+                if not line_bytes:
                     continue
-                event = self._parse_event_line(line)
+                # Events are parsed straight from bytes; only other output
+                # is decoded, for the log and the error tail
+                event = self._parse_event_line(line_bytes)
                 if event is None:
+                    line = line_bytes.decode("utf-8", errors="replace")
+                    logger.info("CLI Output (non-event): %s", line)
+                    output_tail.append(line)
                     continue
                 kind = event.get("event")
                 if kind == "stage":
@@ -202,6 +314,7 @@ class ExacqManService:
                     output = event.get("output")
                     msg = "Footage extraction completed successfully"
                     if output:
+                        reported_output = output
                         msg = f"{msg}: {Path(output).name}"
                     progress_callback(100, msg)
                 elif kind == "error":
@@ -218,25 +331,24 @@ class ExacqManService:
                 elif kind == "warning":
                     logger.warning("CLI warning: %s", event.get("message", ""))
 
-        return last_error
+        return last_error, list(output_tail), reported_output
 
-    def _parse_event_line(self, line: str) -> Optional[Dict[str, Any]]:
-        """Parse a single CLI output line as a JSON event.
+    def _parse_event_line(self, line: bytes) -> Optional[Dict[str, Any]]:
+        """Parse a single raw CLI output line as a JSON event.
 
-        Returns the parsed dict for valid event objects; logs and returns None
-        for anything else so unexpected lines (tracebacks, ffmpeg output, etc.)
-        never break progress tracking.
+        Returns the parsed dict for valid event objects and None for anything
+        else, so unexpected lines (tracebacks, ffmpeg output, etc.) never
+        break progress tracking; the caller logs those.
         """
-        if not (line.startswith("{") and line.endswith("}")):
-            logger.info("CLI Output (non-event): %s", line)
+        if not (line.startswith(b"{") and line.endswith(b"}")):
             return None
         try:
+            # json.loads takes UTF-8 bytes directly; invalid UTF-8 raises
+            # UnicodeDecodeError, which is also a ValueError
             event = json.loads(line)
-        except json.JSONDecodeError:
-            logger.info("CLI Output (non-event): %s", line)
+        except ValueError:
             return None
         if not isinstance(event, dict) or "event" not in event:
-            logger.info("CLI Output (non-event): %s", line)
             return None
         return event
 
@@ -250,10 +362,12 @@ class ExacqManService:
         Returns:
             Generated filename (without .mp4 extension, as exacqman.py adds it automatically)
         """
-        date_str = request.start_datetime.strftime("%Y-%m-%d")
-        time_str = self._format_time_for_filename(request.start_datetime)
-        # Sanitize camera alias: lowercase and replace spaces with hyphens
-        sanitized_camera = request.camera_alias.lower().replace(" ", "-")
+        start = request.start_datetime
+        date_str = f"{start.year:04d}-{start.month:02d}-{start.day:02d}"
+        time_str = self._format_time_for_filename(start)
+        # Sanitize camera alias: lowercase and replace spaces (and anything
+        # else outside [a-z0-9-]) with hyphens
+        sanitized_camera = _UNSAFE_ALIAS_CHARS.sub("-", request.camera_alias.lower())
         return f"{date_str}_{time_str}_{sanitized_camera}_{request.timelapse_multiplier}x"
     
     def _format_time_for_filename(self, datetime_obj) -> str:
@@ -266,28 +380,30 @@ class ExacqManService:
         Returns:
             Formatted time string for filename
         """
-        # Get hour and minute
         hour = datetime_obj.hour
-        minute = datetime_obj.minute
+        period = 'am' if hour < 12 else 'pm'
+        # Format as HHMMam/pm (zero-padded, 12-hour clock)
+        return f"{(hour - 1) % 12 + 1:02d}{datetime_obj.minute:02d}{period}"
+    
+    def _format_time_for_cli(self, datetime_obj) -> str:
+        """
+        Format datetime for the ExacqMan CLI: 9:15am becomes 9:15AM, 11:45pm becomes 11:45PM
         
-        # Convert to 12-hour format
-        if hour == 0:
-            hour_12 = 12
-            period = 'am'
-        elif hour < 12:
-            hour_12 = hour
-            period = 'am'
-        elif hour == 12:
-            hour_12 = 12
-            period = 'pm'
-        else:
-            hour_12 = hour - 12
-            period = 'pm'
+        Built by hand rather than with strftime("%I:%M%p"), which needs the
+        leading zero stripped afterwards and takes AM/PM from the locale.
         
-        # Format as HHMMam/pm (zero-padded)
-        return f"{hour_12:02d}{minute:02d}{period}"
+        Args:
+            datetime_obj: datetime object
+            
+        Returns:
+            Formatted time string for the CLI
+        """
+        hour = datetime_obj.hour
+        period = 'AM' if hour < 12 else 'PM'
+        return f"{(hour - 1) % 12 + 1}:{datetime_obj.minute:02d}{period}"
     
-    async def _cleanup_intermediate_files(self, base_filename: str = None):
+    def _cleanup_intermediate_files(self, base_filename: str = None, keep_path: str = None,
+                                    entries: List[os.DirEntry] = None):
         """
         Clean up intermediate files created during video processing.
         
@@ -296,43 +412,40 @@ class ExacqManService:
         
         Args:
             base_filename: Base filename to clean up specific intermediate files
+            keep_path: Path of the final output, which is never removed
+            entries: Working directory listing to reuse, from _list_working_dir
         """
         try:
             cleaned_files = []
             
-            # Clean up specific intermediate files if base_filename is provided
-            if base_filename:
-                base_name = base_filename.replace('.mp4', '')
-                
-                # Patterns for intermediate files specific to this extraction
-                specific_patterns = [
-                    f"{base_name}.mp4",  # Raw export
-                    f"{base_name}_*.mp4",  # Timelapsed version (before compression)
-                ]
-                
-                for pattern in specific_patterns:
-                    for file_path in self.working_directory.glob(pattern):
-                        if file_path.is_file():
-                            # Skip the final compressed file
-                            if not any(compression in file_path.name for compression in ['_libx264_', '_high', '_medium', '_low']):
-                                file_path.unlink()
-                                cleaned_files.append(file_path.name)
-                                logger.info(f"Cleaned up intermediate file: {file_path.name}")
-            
-            # Clean up general temporary files
-            general_patterns = [
-                "*.tmp",
-                "*_temp.*",
-                "*_intermediate.*",
-                "temp_*",
-                "*.log"
-            ]
+            # Intermediate files specific to this extraction: the raw export
+            # ("<base>.mp4") and the timelapsed version ("<base>_*.mp4")
+            base_name = base_filename.replace('.mp4', '') if base_filename else None
+            raw_export = f"{base_name}.mp4"
+            variant_prefix = f"{base_name}_"
             
-            for pattern in general_patterns:
-                for file_path in self.working_directory.glob(pattern):
-                    if file_path.is_file():
-                        file_path.unlink()
-                        cleaned_files.append(file_path.name)
+            # One directory pass tests every pattern, instead of one glob walk
+            # (and a stat per match) for each pattern
+            if entries is None:
+                entries = self._list_working_dir()
+            for entry in entries:
+                # d_type answers is_file() without a stat; symlinks are
+                # never ours to delete
+                if entry.path == keep_path or not entry.is_file(follow_symlinks=False):
+                    continue
+                name = entry.name
+                
+                if (base_name is not None
+                        and (name == raw_export or (name.startswith(variant_prefix) and name.endswith(".mp4")))
+                        # Skip the final compressed file
+                        and not _COMPRESSED_RE.search(name)):
+                    os.unlink(entry.path)
+                    cleaned_files.append(name)
+                    logger.info(f"Cleaned up intermediate file: {name}")
+                elif _TEMP_FILE_RE.match(name) \
+                        or (base_name is not None and name.startswith(base_name) and name.endswith(".log")):
+                    os.unlink(entry.path)
+                    cleaned_files.append(name)
             
             if cleaned_files:
                 logger.info(f"Cleaned up {len(cleaned_files)} intermediate files: {cleaned_files}")
@@ -343,56 +456,100 @@ class ExacqManService:
             logger.error(f"Error during cleanup: {str(e)}")
             # Don't raise the exception as cleanup failure shouldn't fail the job
     
-    async def _move_to_exports(self, filename: str) -> str:
+    def _list_working_dir(self) -> List[os.DirEntry]:
+        """List the working directory once, for the lookups of a single job."""
+        with os.scandir(self._working_dir) as entries:
+            return list(entries)
+    
+    def _exports_base_name(self, filename: str) -> str:
+        """Return the name the CLI gives this job's files, without extension."""
+        base_name = filename.replace('.mp4', '')  # Remove .mp4 if present
+        # Sanitize base_name to match what CLI creates (spaces become underscores)
+        return base_name.replace(" ", "_")
+    
+    def _find_final_output(self, filename: str, reported_path: str = None,
+                           entries: List[os.DirEntry] = None) -> str:
+        """
+        Locate the final compressed file produced for an extraction.
+        
+        Args:
+            filename: Base name of the file (exacqman.py may create variations)
+            reported_path: Output path from the CLI's done event, if it sent one
+            entries: Working directory listing to reuse, from _list_working_dir
+            
+        Returns:
+            Path of the file to export; it may not exist if the CLI produced nothing
+        """
+        # The CLI names its final file in the done event; when that file is
+        # there, no search is needed (relative paths are from the CLI's cwd)
+        if reported_path:
+            reported_path = os.path.join(self._working_dir, reported_path)
+            if os.path.isfile(reported_path):
+                return reported_path
+        
+        base_name = self._exports_base_name(filename)
+        variant_prefix = f"{base_name}_"
+        high_name = f"{base_name}_libx264_high.mp4"
+        
+        # One directory pass ranks every candidate, in order of preference:
+        # any "<base>_*_libx264_*.mp4" compressed file, then the specific high
+        # compression name, then the original filename with or without .mp4
+        best_path = None
+        best_rank = 4
+        if entries is None:
+            entries = self._list_working_dir()
+        for entry in entries:
+            name = entry.name
+            if name.startswith(variant_prefix) and name.endswith(".mp4") \
+                    and "_libx264_" in name[len(variant_prefix):]:
+                rank = 0
+            elif name == high_name:
+                rank = 1
+            elif name == filename:
+                rank = 2
+            elif name == f"{filename}.mp4":
+                rank = 3
+            else:
+                continue
+            if rank < best_rank and entry.is_file():
+                best_path, best_rank = entry.path, rank
+                if rank == 0:
+                    break
+        
+        # Nothing found: report the plain .mp4 name, which the move will fail on
+        return best_path or os.path.join(self._working_dir, f"{filename}.mp4")
+    
+    def _move_to_exports(self, filename: str, source_path: str = None) -> str:
         """
         Move the final compressed file to the exports directory.
         
         Args:
             filename: Base name of the file to move (exacqman.py may create variations)
+            source_path: Final file already found by _find_final_output, if any
             
         Returns:
             Path to the file in exports directory
         """
         try:
-            # Create exports directory if it doesn't exist
-            exports_dir = self.working_directory / "exacqman-web" / "exports"
-            exports_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Look for the final compressed file with any compression level
-            base_name = filename.replace('.mp4', '')  # Remove .mp4 if present
-            # Sanitize base_name to match what CLI creates (spaces become underscores)
-            base_name = base_name.replace(" ", "_")
-            source_path = None
-            
-            # Try to find the final compressed file with libx264 pattern
-            for file_path in self.working_directory.glob(f"{base_name}_*_libx264_*.mp4"):
-                if file_path.is_file():
-                    source_path = file_path
-                    break
-            
-            # If not found, try the specific high compression pattern
-            if not source_path:
-                final_filename = f"{base_name}_libx264_high.mp4"
-                source_path = self.working_directory / final_filename
-                if not source_path.exists():
-                    source_path = None
-            
-            # Fallback to original filename if no compressed version found
-            if not source_path:
-                source_path = self.working_directory / filename
-                if not source_path.exists():
-                    source_path = self.working_directory / f"{filename}.mp4"
-            
-            if not source_path or not source_path.exists():
-                raise FileNotFoundError(f"Final compressed file not found for: {filename}")
+            if source_path is None:
+                source_path = self._find_final_output(filename)
+            base_name = self._exports_base_name(filename)
             
             # Move to exports directory with clean filename
             clean_filename = f"{base_name}.mp4"
-            dest_path = exports_dir / clean_filename
-            shutil.move(str(source_path), str(dest_path))
+            dest_path = os.path.join(self.exports_dir, clean_filename)
+            try:
+                _replace_or_move(source_path, dest_path)
+            except FileNotFoundError:
+                if not os.path.exists(source_path):
+                    raise FileNotFoundError(f"Final compressed file not found for: {filename}")
+                # The source is there, so the exports directory was removed
+                # after startup; recreate it and try again
+                os.makedirs(self.exports_dir, exist_ok=True)
+                _replace_or_move(source_path, dest_path)
             
-            logger.info(f"Moved final compressed file {source_path.name} to exports directory as {clean_filename}")
-            return str(dest_path)
+            logger.info(f"Moved final compressed file {os.path.basename(source_path)} to exports directory as {clean_filename}")
+            return dest_path
             
         except Exception as e:
             logger.error(f"Error moving file to exports: {str(e)}")
@@ -408,13 +565,14 @@ class ExacqManService:
         Returns:
             True if valid, False otherwise
         """
+        if not os.path.isabs(config_path):
+            config_path = os.path.join(self._working_dir, config_path)
+        
+        # os.access reports filesystem errors as False; only a malformed
+        # path (an embedded null byte) raises
         try:
-            if not config_path.startswith('/'):
-                config_path = str(self.working_directory / config_path)
-            
-            return Path(config_path).exists()
-        except Exception as e:
-            logger.error(f"Error validating config file {config_path}: {str(e)}")
+            return os.access(config_path, os.R_OK)
+        except ValueError:
             return False
     
     def get_available_configs(self) -> list:
@@ -425,10 +583,11 @@ class ExacqManService:
             List of configuration file paths
         """
         try:
-            config_files = []
-            for file_path in self.working_directory.glob("*.config"):
-                config_files.append(str(file_path))
-            return config_files
-        except Exception as e:
+            with os.scandir(self._working_dir) as entries:
+                return [
+                    entry.path for entry in entries
+                    if entry.name.endswith(".config") and entry.is_file()
+                ]
+        except OSError as e:
             logger.error(f"Error getting available configs: {str(e)}")
             return []
\ No newline at end of file
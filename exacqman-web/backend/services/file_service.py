@@ -4,57 +4,181 @@ File Service
 Handles file operations for processed videos in the ExacqMan web application.
 """
 
+import heapq
 import os
+import re
 import shutil
+import threading
 import logging
+import time
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
 
 from api.models import FileInfo
 
 logger = logging.getLogger(__name__)
 
+# Extensions listed as processed videos
+VIDEO_EXTENSIONS = frozenset({'.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv'})
+
+# Format: YYYY-MM-DD_HHMMam/pm_camera_multiplierx (extension removed). Only
+# the last two underscore-separated parts are read: the camera alias and the
+# timelapse multiplier; at least two parts must precede them.
+_METADATA_RE = re.compile(r"(?:[^_]*_){2,}(?P<camera>[^_]*)_(?P<multiplier>\d+)x")
+
+def _file_extension(filename: str) -> str:
+    """Return the lowercased extension of a file name, or '' if it has none."""
+    # A leading dot marks a hidden file, not an extension (as in os.path.splitext)
+    i = filename.rfind('.')
+    return filename[i:].lower() if i > 0 else ''
+
 class FileService:
     """Service for handling processed video files."""
     
+    # Seconds a directory listing is reused while the directory is unchanged
+    LISTING_TTL = 1.0
+    
     def __init__(self):
         """Initialize the file service."""
         # exports directory is at the same level as backend directory
         self.exports_dir = Path("../exports")
-        self.allowed_extensions = {'.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv'}
+        self.allowed_extensions = VIDEO_EXTENSIONS
         
         # Ensure exports directory exists
         self.exports_dir.mkdir(exist_ok=True)
+        
+        # (directory mtime_ns, monotonic time, listing) of the last scan
+        self._listing_cache: Optional[Tuple[Optional[int], float, List[FileInfo]]] = None
+        # (name, size, mtime_ns, ctime) of each video in the last full scan, and a
+        # version bumped whenever a scan finds it changed. The epoch ties
+        # versions to this instance, so a restart never reuses one.
+        self._listing_signature: Optional[Tuple[Tuple[str, int, int, float], ...]] = None
+        self._listing_version = 0
+        self._listing_epoch = time.time_ns()
+        self._listing_lock = threading.Lock()
     
-    def get_processed_videos(self) -> List[FileInfo]:
+    def get_processed_videos(self, limit: Optional[int] = None) -> List[FileInfo]:
         """
         Get list of processed video files in the exports directory.
         
+        Args:
+            limit: If given, return only this many of the newest videos
+            
         Returns:
-            List of FileInfo objects for processed videos
+            List of FileInfo objects for processed videos, newest first
         """
         try:
-            video_files = []
-            
-            if not self.exports_dir.exists():
-                return video_files
-            
-            for file_path in self.exports_dir.iterdir():
-                if file_path.is_file() and self._is_allowed_file_type(file_path.name):
-                    file_info = self._create_file_info(file_path)
-                    video_files.append(file_info)
-            
-            # Sort by creation time (newest first)
-            video_files.sort(key=lambda x: x.created_at, reverse=True)
-            
-            logger.info(f"Found {len(video_files)} processed video files")
-            return video_files
-            
+            # Listings run in worker threads; the lock makes concurrent
+            # requests wait for one scan instead of each rescanning
+            with self._listing_lock:
+                dir_mtime_ns = self._exports_mtime_ns()
+                now = time.monotonic()
+                cached = self._fresh_listing(dir_mtime_ns, now)
+                if cached is not None:
+                    return cached[:limit]
+                
+                timed_files = self._scan_exports()
+                if limit is not None:
+                    # Only the newest few are wanted: pick them with a bounded heap
+                    # and build FileInfo for those alone. A partial listing can't
+                    # serve later requests, so it isn't cached.
+                    newest = heapq.nlargest(limit, timed_files, key=itemgetter(0))
+                    return [self._create_file_info(path, file_stat) for _, path, file_stat in newest]
+                
+                return list(self._store_listing(dir_mtime_ns, now, timed_files))
+                
         except Exception as e:
             logger.error(f"Error listing processed videos: {str(e)}")
             return []
     
+    def listing_version(self) -> Tuple[int, int]:
+        """
+        Get a key that changes whenever the processed video listing does.
+        
+        While the last scan is fresh this costs one directory stat; otherwise
+        the directory is rescanned. The key only moves when the videos' names,
+        sizes or times actually changed, so it suits an ETag.
+        
+        Returns:
+            Tuple of (instance epoch, listing version)
+        """
+        with self._listing_lock:
+            dir_mtime_ns = self._exports_mtime_ns()
+            now = time.monotonic()
+            if self._fresh_listing(dir_mtime_ns, now) is None:
+                self._store_listing(dir_mtime_ns, now, self._scan_exports())
+            return self._listing_epoch, self._listing_version
+    
+    def _exports_mtime_ns(self) -> Optional[int]:
+        """Return the exports directory's mtime in nanoseconds, or None if it is missing."""
+        try:
+            return os.stat(self.exports_dir).st_mtime_ns
+        except FileNotFoundError:
+            return None
+    
+    def _fresh_listing(self, dir_mtime_ns: Optional[int], now: float) -> Optional[List[FileInfo]]:
+        """
+        Return the cached listing if it can still be served, else None.
+        
+        The UI polls the listing; a recent scan is reused unless a file was
+        added, removed or renamed since (any of which bumps the directory
+        mtime). Files rewritten in place don't, hence LISTING_TTL.
+        """
+        cached = self._listing_cache
+        if cached is not None and cached[0] == dir_mtime_ns and now - cached[1] < self.LISTING_TTL:
+            return cached[2]
+        return None
+    
+    def _scan_exports(self) -> List[Tuple[float, str, os.stat_result]]:
+        """
+        Stat the processed videos in the exports directory.
+        
+        Returns:
+            (st_ctime, path, stat) tuples, so sorting compares numbers rather
+            than the formatted created_at strings
+        """
+        timed_files = []
+        try:
+            # scandir reports the entry type from the directory read, so only
+            # matching files cost a stat
+            with os.scandir(self.exports_dir) as entries:
+                for entry in entries:
+                    if entry.is_file() and self._is_allowed_file_type(entry.name):
+                        try:
+                            file_stat = entry.stat()
+                        except OSError:
+                            continue  # removed while listing
+                        timed_files.append((file_stat.st_ctime, entry.path, file_stat))
+        except FileNotFoundError:
+            pass  # no exports directory means no videos
+        return timed_files
+    
+    def _store_listing(self, dir_mtime_ns: Optional[int], now: float,
+                       timed_files: List[Tuple[float, str, os.stat_result]]) -> List[FileInfo]:
+        """
+        Build and cache the full listing from a scan, bumping the version if it changed.
+        
+        Returns:
+            List of FileInfo objects, newest first
+        """
+        # Sort by creation time (newest first)
+        timed_files.sort(key=itemgetter(0), reverse=True)
+        video_files = [self._create_file_info(path, file_stat) for _, path, file_stat in timed_files]
+        
+        signature = tuple(
+            (os.path.basename(path), file_stat.st_size, file_stat.st_mtime_ns, ctime)
+            for ctime, path, file_stat in timed_files
+        )
+        if signature != self._listing_signature:
+            self._listing_signature = signature
+            self._listing_version += 1
+        
+        self._listing_cache = (dir_mtime_ns, now, video_files)
+        logger.info(f"Found {len(video_files)} processed video files")
+        return video_files
+    
     def get_file_path(self, filename: str) -> str:
         """
         Get the full path to a processed video file.
@@ -68,11 +192,11 @@ class FileService:
         Raises:
             FileNotFoundError: If file is not found
         """
-        file_path = self.exports_dir / filename
-        if not file_path.exists():
+        file_path = os.path.join(self.exports_dir, filename)
+        if not os.path.isfile(file_path):
             raise FileNotFoundError(f"Processed video not found: {filename}")
         
-        return str(file_path)
+        return file_path
     
     def delete_file(self, filename: str) -> bool:
         """
@@ -85,8 +209,7 @@ class FileService:
             True if deleted successfully, False otherwise
         """
         try:
-            file_path = Path(self.get_file_path(filename))
-            file_path.unlink()
+            os.unlink(self.get_file_path(filename))
             logger.info(f"Processed video deleted successfully: {filename}")
             return True
         except Exception as e:
@@ -120,15 +243,20 @@ class FileService:
         """
         try:
             deleted_count = 0
-            cutoff_time = datetime.now().timestamp() - (max_age_days * 24 * 60 * 60)
+            cutoff_time = time.time() - (max_age_days * 24 * 60 * 60)
             
-            for file_path in self.exports_dir.iterdir():
-                if file_path.is_file() and self._is_allowed_file_type(file_path.name):
-                    file_age = file_path.stat().st_mtime
-                    if file_age < cutoff_time:
-                        file_path.unlink()
+            with os.scandir(self.exports_dir) as entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False) and self._is_allowed_file_type(entry.name):
+                        try:
+                            file_age = entry.stat(follow_symlinks=False).st_mtime
+                            if file_age >= cutoff_time:
+                                continue
+                            os.unlink(entry.path)
+                        except FileNotFoundError:
+                            continue  # removed while scanning
                         deleted_count += 1
-                        logger.info(f"Cleaned up old processed video: {file_path.name}")
+                        logger.info(f"Cleaned up old processed video: {entry.name}")
             
             return deleted_count
             
@@ -146,32 +274,34 @@ class FileService:
         Returns:
             True if file type is allowed
         """
-        file_extension = Path(filename).suffix.lower()
-        return file_extension in self.allowed_extensions
+        return _file_extension(filename) in self.allowed_extensions
     
-    def _create_file_info(self, file_path: Path) -> FileInfo:
+    def _create_file_info(self, file_path: str, file_stat: Optional[os.stat_result] = None) -> FileInfo:
         """
         Create a FileInfo object from a file path.
         
         Args:
             file_path: Path to the file
+            file_stat: Stat result for the file, if already known
             
         Returns:
             FileInfo object
         """
+        filename = os.path.basename(file_path)
+        file_type = _file_extension(filename)
         try:
-            stat = file_path.stat()
+            stat = file_stat if file_stat is not None else os.stat(file_path)
             
             # Try to extract metadata from filename
-            camera_alias, timelapse_multiplier = self._parse_filename_metadata(file_path.name)
+            camera_alias, timelapse_multiplier = self._parse_filename_metadata(filename)
             
             return FileInfo(
-                filename=file_path.name,
-                path=str(file_path),
+                filename=filename,
+                path=file_path,
                 size=stat.st_size,
                 created_at=datetime.fromtimestamp(stat.st_ctime).isoformat(),
                 modified_at=datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                file_type=file_path.suffix.lower(),
+                file_type=file_type,
                 camera_alias=camera_alias,
                 timelapse_multiplier=timelapse_multiplier
             )
@@ -179,12 +309,12 @@ class FileService:
             logger.error(f"Error creating file info for {file_path}: {str(e)}")
             # Return minimal file info
             return FileInfo(
-                filename=file_path.name,
-                path=str(file_path),
+                filename=filename,
+                path=file_path,
                 size=0,
                 created_at=datetime.now().isoformat(),
                 modified_at=datetime.now().isoformat(),
-                file_type=file_path.suffix.lower(),
+                file_type=file_type,
                 camera_alias=None,
                 timelapse_multiplier=None
             )
@@ -201,34 +331,11 @@ class FileService:
         Returns:
             Tuple of (camera_alias, timelapse_multiplier)
         """
-        try:
-            # Remove extension
-            name_without_ext = Path(filename).stem
-            
-            # Split by underscore
-            parts = name_without_ext.split('_')
-            
-            if len(parts) >= 4:
-                # Format: YYYY-MM-DD_HHMMam/pm_camera_multiplierx
-                # parts[0] = date, parts[1] = time, parts[2] = camera, parts[3] = multiplier
-                
-                # Last part should be the multiplier (e.g., "10x")
-                multiplier_part = parts[-1]
-                if multiplier_part.endswith('x'):
-                    try:
-                        multiplier = int(multiplier_part[:-1])
-                    except ValueError:
-                        multiplier = None
-                else:
-                    multiplier = None
-                
-                # Camera alias is the second-to-last part
-                camera_alias = parts[-2] if multiplier is not None else None
-                
-                return camera_alias, multiplier
-            
+        # Remove extension
+        i = filename.rfind('.')
+        name_without_ext = filename[:i] if i > 0 else filename
+        
+        match = _METADATA_RE.fullmatch(name_without_ext)
+        if match is None:
             return None, None
-            
-        except Exception as e:
-            logger.error(f"Error parsing filename metadata from {filename}: {str(e)}")
-            return None, None
\ No newline at end of file
+        return match['camera'], int(match['multiplier'])
\ No newline at end of file
@@ -0,0 +1,159 @@
+"""
+Job Store
+
+Tracks the state of background processing jobs for the ExacqMan web application.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+from api.models import JobStatusEnum
+
+logger = logging.getLogger(__name__)
+
+@dataclass(slots=True)
+class JobRecord:
+    """
+    In-memory state for a single background job.
+    
+    Timestamps are stored as integer epoch nanoseconds (time.time_ns()) and only
+    formatted to ISO 8601 when a status response needs them; the formatted
+    string is cached on the record.
+    
+    Writers change the record through update(), or call notify() after
+    assigning fields directly, so that status streams waiting on
+    next_change() wake up.
+    """
+    status: JobStatusEnum
+    created_at: int
+    operation: str
+    progress: int = 0
+    message: str = ""
+    completed_at: Optional[int] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    request: Optional[Dict[str, Any]] = None
+    _created_at_iso: Optional[str] = field(default=None, init=False, repr=False)
+    _completed_at_iso: Optional[str] = field(default=None, init=False, repr=False)
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, init=False, repr=False)
+    
+    def notify(self) -> None:
+        """Wake every waiter on the current change event and arm a fresh one."""
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+    
+    def update(self, **fields: Any) -> None:
+        """Set several fields together, then wake status streams with one notify()."""
+        for name, value in fields.items():
+            setattr(self, name, value)
+        self.notify()
+    
+    def next_change(self) -> asyncio.Event:
+        """Return the event that the next notify() call will set."""
+        return self._changed
+    
+    def is_finished(self) -> bool:
+        """Return True once the job has completed or failed."""
+        return self.status in (JobStatusEnum.COMPLETED, JobStatusEnum.FAILED)
+    
+    def created_at_iso(self) -> str:
+        """Return the creation time as an ISO 8601 string."""
+        if self._created_at_iso is None:
+            self._created_at_iso = datetime.fromtimestamp(self.created_at / 1e9).isoformat()
+        return self._created_at_iso
+    
+    def completed_at_iso(self) -> Optional[str]:
+        """Return the completion time as an ISO 8601 string, if the job has finished."""
+        if self.completed_at is None:
+            return None
+        if self._completed_at_iso is None:
+            self._completed_at_iso = datetime.fromtimestamp(self.completed_at / 1e9).isoformat()
+        return self._completed_at_iso
+
+class JobStore:
+    """
+    In-process registry of job records, keyed by job ID.
+    
+    State lives in this process only, so the server must run as a single
+    worker for status lookups and status streams to see every job. Keeping all
+    access behind this class leaves one place to swap in a shared backend.
+    """
+    
+    def __init__(self, max_jobs: int = 1000):
+        """
+        Initialize the job store.
+        
+        Args:
+            max_jobs: Upper bound on tracked jobs; the oldest finished jobs are
+                evicted to stay under it
+        """
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, JobRecord]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._jobs)
+    
+    def get(self, job_id: str) -> Optional[JobRecord]:
+        """
+        Look up a job record.
+        
+        Args:
+            job_id: Unique job identifier
+            
+        Returns:
+            The JobRecord, or None if the job is unknown or has been evicted
+        """
+        return self._jobs.get(job_id)
+    
+    def add(self, job_id: str, job: JobRecord) -> None:
+        """
+        Start tracking a new job, evicting old finished jobs if the store is full.
+        
+        Args:
+            job_id: Unique job identifier
+            job: Initial state of the job
+        """
+        self._evict_finished(len(self._jobs) - self.max_jobs + 1)
+        self._jobs[job_id] = job
+    
+    def purge_finished(self, max_age: float) -> int:
+        """
+        Drop completed or failed jobs that finished more than max_age seconds ago.
+        
+        Args:
+            max_age: How long finished jobs stay queryable, in seconds
+            
+        Returns:
+            Number of jobs removed
+        """
+        cutoff = time.time_ns() - int(max_age * 1_000_000_000)
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.completed_at is not None and job.completed_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+        return len(expired)
+    
+    def _evict_finished(self, count: int) -> None:
+        """Drop up to count of the oldest completed or failed jobs."""
+        if count <= 0:
+            return
+        
+        # Insertion order is creation order; queued and running jobs are never dropped
+        finished = []
+        for job_id, job in self._jobs.items():
+            if job.is_finished():
+                finished.append(job_id)
+                if len(finished) == count:
+                    break
+        for job_id in finished:
+            del self._jobs[job_id]
+        
+        if finished:
+            logger.debug(f"Evicted {len(finished)} finished jobs")
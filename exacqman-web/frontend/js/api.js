@@ -149,6 +149,15 @@ class ExacqManAPI {
         return await this.request(`/status/${encodeURIComponent(jobId)}`);
     }
 
+    /**
+     * Get the server-sent events URL for a job's status stream
+     * @param {string} jobId - Job identifier
+     * @returns {string} Status stream URL
+     */
+    getJobStatusStreamURL(jobId) {
+        return `${this.baseURL}/status/${encodeURIComponent(jobId)}/stream`;
+    }
+
     // File management
 
     /**
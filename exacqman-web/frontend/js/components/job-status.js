@@ -339,17 +339,60 @@ class JobStatus {
 
 /**
  * Job Poller Class
+ *
+ * Follows job status over the server-sent event stream, falling back to
+ * interval polling when EventSource is unavailable or the stream fails.
  */
 class JobPoller {
     constructor(apiClient, onUpdate) {
         this.api = apiClient;
         this.onUpdate = onUpdate;
+        this.streams = new Map();
         this.activeJobs = new Set();
         this.intervalId = null;
         this.pollInterval = 1000; // 1 second for real-time progress updates
     }
 
     start(jobId) {
+        if (typeof EventSource !== 'undefined') {
+            this.openStream(jobId);
+        } else {
+            this.startPolling(jobId);
+        }
+    }
+
+    openStream(jobId) {
+        this.closeStream(jobId);
+        const source = new EventSource(this.api.getJobStatusStreamURL(jobId));
+        this.streams.set(jobId, source);
+
+        source.onmessage = (event) => {
+            const status = JSON.parse(event.data);
+            this.onUpdate(jobId, status);
+
+            // The server ends the stream after a terminal status
+            if (status.status === 'completed' || status.status === 'failed') {
+                this.closeStream(jobId);
+            }
+        };
+
+        source.onerror = () => {
+            // Don't let EventSource keep reconnecting; poll this job instead
+            console.warn(`Status stream for job ${jobId} failed, falling back to polling`);
+            this.closeStream(jobId);
+            this.startPolling(jobId);
+        };
+    }
+
+    closeStream(jobId) {
+        const source = this.streams.get(jobId);
+        if (source) {
+            source.close();
+            this.streams.delete(jobId);
+        }
+    }
+
+    startPolling(jobId) {
         this.activeJobs.add(jobId);
         
         if (!this.intervalId) {
@@ -359,8 +402,12 @@ class JobPoller {
 
     stop(jobId) {
         if (jobId) {
+            this.closeStream(jobId);
             this.activeJobs.delete(jobId);
         } else {
+            for (const id of Array.from(this.streams.keys())) {
+                this.closeStream(id);
+            }
             this.activeJobs.clear();
         }
         
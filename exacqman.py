@@ -10,6 +10,7 @@ from exacqvision import Exacqvision, ExacqvisionError
 from progress import init_reporter, get_reporter
 import cv2
 import argparse
+import os
 
 
 @dataclass
@@ -118,6 +119,15 @@ def import_config(config_file: str) -> ConfigParser:
     return config
 
 
+def _is_int(value: str) -> bool:
+    """Checks whether a config value parses as an integer, without raising on failure."""
+    value = value.strip()
+    if value[:1] in ('+', '-'):
+        value = value[1:]
+    # isdecimal rather than isdigit: int() rejects superscripts and the like
+    return value.isdecimal()
+
+
 def validate_config(config: ConfigParser) -> bool:
     """
     Validates the configuration file for required sections and values.
@@ -168,14 +178,9 @@ def validate_config(config: ConfigParser) -> bool:
 
     if 'timelapse_multiplier' not in config['Settings'] or not config['Settings']['timelapse_multiplier'].strip():
         errors.append('timelapse_multiplier is missing or empty. Program will default to 10') 
-    else:
-        try:
-            if (int(config['Settings']['timelapse_multiplier']) <= 0):
-                errors.append('timelapse_multiplier must be a positive integer')
-                fatal = True
-        except ValueError:
-            errors.append('timelapse_multiplier must be a positive integer')
-            fatal = True
+    elif not _is_int(config['Settings']['timelapse_multiplier']) or int(config['Settings']['timelapse_multiplier']) <= 0:
+        errors.append('timelapse_multiplier must be a positive integer')
+        fatal = True
 
     if 'compression_level' not in config['Settings'] or not config['Settings']['compression_level'].strip():
         errors.append('compression_level is missing or empty. Program will default to medium') 
@@ -193,14 +198,9 @@ def validate_config(config: ConfigParser) -> bool:
     
     if 'font_weight' not in config['Settings'] or not config['Settings']['font_weight'].strip():
         errors.append('font_weight is missing or empty. Program will default to 2')
-    else:
-        try:
-            if (int(config['Settings']['font_weight']) <= 0):
-                errors.append('font_weight must be a positive integer')
-                fatal = True
-        except ValueError:
-            errors.append('font_weight must be a postive integer')
-            fatal = True
+    elif not _is_int(config['Settings']['font_weight']) or int(config['Settings']['font_weight']) <= 0:
+        errors.append('font_weight must be a positive integer')
+        fatal = True
 
     if 'caption' not in config['Settings']:
         errors.append('caption is missing from Settings header.')
@@ -220,12 +220,9 @@ def validate_config(config: ConfigParser) -> bool:
         if not camera_value.strip():
             errors.append(f'Camera {camera_number} has no id')
             fatal = True
-        else:
-            try:
-                int(camera_value)
-            except ValueError:
-                errors.append(f'Camera ID {camera_number} must be an integer')
-                fatal = True
+        elif not _is_int(camera_value):
+            errors.append(f'Camera ID {camera_number} must be an integer')
+            fatal = True
 
 
     if errors:
@@ -355,7 +352,8 @@ def process_video(original_video_path: str, output_video_path: str = None, times
 
     # If not specified, rename the output file to the same as input with speed appended to it (e.g. video_4x.mp4)
     if output_video_path is None:
-        output_video_path=f'_{multiplier}x.'.join(original_video_path.split('.'))
+        base, ext = os.path.splitext(original_video_path)
+        output_video_path = f'{base}_{multiplier}x{ext}'
 
     vid = cv2.VideoCapture(original_video_path)
     if not vid.isOpened():
@@ -403,31 +401,38 @@ def process_video(original_video_path: str, output_video_path: str = None, times
     count = 0
 
     while success:
-        if settings.crop:
-            finished_frame = frame[y:y+crop_height, x:x+crop_width]
-            if finished_frame.shape[:2] != (crop_height, crop_width):
-                reporter.warning(
-                    f"Cropped frame size {finished_frame.shape[:2]} doesn't match "
-                    f"expected ({crop_height}, {crop_width})"
-                )
-        else:
-            finished_frame = frame
-
-        if timestamps:
-            frame_position = vid.get(cv2.CAP_PROP_POS_FRAMES)
-            current_timestamp = timestamps[int(frame_position / total_frames * (number_of_timestamps - 1))]
-            timestamp_string = current_timestamp.strftime('%Y-%m-%d %H:%M:%S')
-            x_pos, y_pos = calculate_xy_text_position(crop_height, crop_width, timestamp_string, font_scale)
-            cv2.putText(finished_frame, timestamp_string, (x_pos, y_pos), cv2.FONT_HERSHEY_SIMPLEX, font_scale, (255, 255, 255), settings.font_weight, cv2.LINE_AA)
-            caption_font_scale = font_scale*0.8
-            caption_x, caption_y = calculate_xy_text_position(crop_height*.85, crop_width, settings.caption, caption_font_scale)
-            cv2.putText(finished_frame, settings.caption, (caption_x, caption_y), cv2.FONT_HERSHEY_SIMPLEX, caption_font_scale, (255, 255, 255), settings.font_weight, cv2.LINE_AA)
-
+        # Only every multiplier-th frame is written, so skip cropping and
+        # timestamping the frames that would be dropped
         if count % multiplier == 0:
+            if settings.crop:
+                finished_frame = frame[y:y+crop_height, x:x+crop_width]
+                if finished_frame.shape[:2] != (crop_height, crop_width):
+                    reporter.warning(
+                        f"Cropped frame size {finished_frame.shape[:2]} doesn't match "
+                        f"expected ({crop_height}, {crop_width})"
+                    )
+            else:
+                finished_frame = frame
+
+            if timestamps:
+                frame_position = vid.get(cv2.CAP_PROP_POS_FRAMES)
+                current_timestamp = timestamps[int(frame_position / total_frames * (number_of_timestamps - 1))]
+                timestamp_string = current_timestamp.strftime('%Y-%m-%d %H:%M:%S')
+                x_pos, y_pos = calculate_xy_text_position(crop_height, crop_width, timestamp_string, font_scale)
+                cv2.putText(finished_frame, timestamp_string, (x_pos, y_pos), cv2.FONT_HERSHEY_SIMPLEX, font_scale, (255, 255, 255), settings.font_weight, cv2.LINE_AA)
+                caption_font_scale = font_scale*0.8
+                caption_x, caption_y = calculate_xy_text_position(crop_height*.85, crop_width, settings.caption, caption_font_scale)
+                cv2.putText(finished_frame, settings.caption, (caption_x, caption_y), cv2.FONT_HERSHEY_SIMPLEX, caption_font_scale, (255, 255, 255), settings.font_weight, cv2.LINE_AA)
+
             writer.write(finished_frame)
 
-        success, frame = vid.read()
         count += 1
+        # Frames that will be dropped only need grabbing, which advances the
+        # decoder without converting and copying the frame out to Python
+        if count % multiplier == 0:
+            success, frame = vid.read()
+        else:
+            success = vid.grab()
         reporter.update("timelapsing", count, total_frames, unit="frames")
 
     writer.release()
@@ -460,7 +465,8 @@ def compress_video(original_video_path: str, compressed_video_path: str = None,
 
     # If not specified, rename the output file to the same as input with codec and bitrate appended to it (e.g. video_libx264_500K.mp4)
     if compressed_video_path is None:
-        compressed_video_path = f'_{codec}_{quality}.'.join(original_video_path.split('.'))
+        base, ext = os.path.splitext(original_video_path)
+        compressed_video_path = f'{base}_{codec}_{quality}{ext}'
 
     if quality == 'low':
         bitrate = '250K'
@@ -6,6 +6,9 @@ from zoneinfo import ZoneInfo
 
 from progress import get_reporter
 
+# Shared rather than looked up on every conversion
+_GMT = ZoneInfo('GMT')
+
 
 class ExacqvisionError(Exception):
     """Custom exception for Exacqvision API errors."""
@@ -87,7 +90,7 @@ class Exacqvision:
         '''Converts a GMT datetime to the local timezone.'''
 
         # Parse the input string and assign the timezone in one line
-        gmt_datetime = time.replace(tzinfo=ZoneInfo('GMT'))
+        gmt_datetime = time.replace(tzinfo=_GMT)
 
         # Convert to GMT timezone
         local_datetime = gmt_datetime.astimezone(self.timezone)
@@ -102,7 +105,7 @@ class Exacqvision:
         local_datetime = time.replace(tzinfo=self.timezone)
 
         # Convert to GMT timezone
-        gmt_datetime = local_datetime.astimezone(ZoneInfo('GMT'))
+        gmt_datetime = local_datetime.astimezone(_GMT)
 
         return gmt_datetime
     
@@ -336,8 +339,8 @@ class Exacqvision:
         def generate_time_range(start_time, stop_time, stepsize=1):
 
             # Change to datetime object and then convert to local timezone
-            start_datetime = self.convert_GMT_to_local(datetime.strptime(start_time, '%Y-%m-%dT%H:%M:%SZ'))
-            stop_datetime = self.convert_GMT_to_local(datetime.strptime(stop_time, '%Y-%m-%dT%H:%M:%SZ'))
+            start_datetime = self.convert_GMT_to_local(datetime.fromisoformat(start_time.removesuffix('Z')))
+            stop_datetime = self.convert_GMT_to_local(datetime.fromisoformat(stop_time.removesuffix('Z')))
 
             delta = timedelta(seconds=stepsize)
 